@@ -20,23 +20,37 @@ Day range policy:
 
 from __future__ import annotations
 
+import gzip
+import hashlib
 import os
 import sqlite3
 import json
+import threading
+import time
 import html as html_lib
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urlencode
 
 import requests
-from flask import Flask, request, Response
+from requests.adapters import HTTPAdapter
+from flask import Flask, request, Response, send_file
+from jinja2 import Environment, FileSystemLoader
 
 try:
     from zoneinfo import ZoneInfo
 except Exception:
     ZoneInfo = None  # type: ignore
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
 # ---------------- CONFIG ----------------
 
 DEFAULT_TZ = "Asia/Manila"
@@ -61,6 +75,12 @@ BATTERY_NOMINAL_VOLTAGE = 51.2
 SKYBLUE = "#87CEEB"
 VIOLET = "#8A2BE2"
 
+# Updated POP (pill/badge) colors
+POP_WHITE = "#FFFFFF"  # < 30
+POP_GREEN = "#D1E7DD"  # 30–50 (light green)
+POP_YELLOW = "#FFF3CD" # 51–80
+POP_RED = "#F8D7DA"    # > 80
+
 # Time column palette (from your image)
 TC_1 = "#FFF2BD"
 TC_2 = "#F4D797"
@@ -69,9 +89,15 @@ TC_4 = "#DA7F7D"
 TC_5 = "#B5728E"
 TC_6 = "#776E99"
 
+# Per-place fetch fan-out (used when the batched forecast request fails)
+MAX_FORECAST_WORKERS = 16
+
 # Day changer range: today .. today+4
 FUTURE_DAYS_ALLOWED = 4
 
+# Matrix cell when a place has no data for an hour: icon, precip_mm, pop_pct, solar_wm2
+EMPTY_CELL: Tuple[str, float, int, float] = ("—", 0.0, 0, 0.0)
+
 WEATHER_ICONS_NO_RAIN = {
     "clear_day": "☀️",
     "clear_night": "🌙",
@@ -83,9 +109,17 @@ WEATHER_ICONS_NO_RAIN = {
 # SQLite cache DB path (override via env var)
 CACHE_DB_PATH = os.environ.get("RAIN_CACHE_DB", "rain_cache.sqlite3")
 
+# Cached pages are also written here as <sha1(key)>.html.gz, for send_file (override via env var)
+CACHE_HTML_DIR = os.environ.get("RAIN_CACHE_DIR", "rain_cache_html")
+
 # Cache policy
 CACHE_TTL_SECONDS = 60 * 60          # 1 hour
 CACHE_RETENTION_DAYS = 2             # delete rows older than 2 days
+HTML_MEMO_MAX_ENTRIES = 256          # in-process copies of cached pages
+CACHE_GZIP_LEVEL = 6                 # cached pages are stored gzip-compressed
+CACHE_FILE_SWEEP_SECONDS = 60 * 60   # how often cache_put sweeps expired page files
+BROWSER_MAX_AGE_SECONDS = 60 * 5     # Cache-Control max-age on cached pages
+STATIC_MAX_AGE_SECONDS = 60 * 60 * 24 * 365  # /static/ URLs are versioned by content hash
 
 # ---------------- DATA ----------------
 
@@ -106,6 +140,13 @@ def _to_float(x, default: float = 0.0) -> float:
         return default
 
 
+def _json_loads(content: bytes):
+    """Parses an API response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
 def is_day(dt: datetime) -> bool:
     return DAY_START_HOUR <= dt.hour < DAY_END_HOUR
 
@@ -114,32 +155,56 @@ def precip_display(p_mm: float) -> str:
     return "-" if _to_float(p_mm) <= 0 else f"{p_mm:.1f}"
 
 
-def weather_icon(cloudcover_pct: float, precipitation_mm: float, dt: datetime) -> str:
-    cc = _to_float(cloudcover_pct)
-    p = _to_float(precipitation_mm)
-    dayflag = is_day(dt)
+def weather_icons(cloudcover_pct: List[float], precipitation_mm: List[float], times: List[datetime]) -> List[str]:
+    """
+    Weather icon for each hour of a column, in one call.
 
-    if p > 0:
-        if p <= LIGHT_MAX:
-            return "🌦️" if dayflag else "🌧️"
-        elif p <= MODERATE_MAX:
-            return "🌧️"
-        return "⛈️"
+    Thresholds and icons are bound to locals once, so the per-cell work is
+    just the comparisons.
+    """
+    light_max, moderate_max = LIGHT_MAX, MODERATE_MAX
+    clear_max, partly_max = CLEAR_MAX, PARTLY_MAX
+    clear_day = WEATHER_ICONS_NO_RAIN["clear_day"]
+    clear_night = WEATHER_ICONS_NO_RAIN["clear_night"]
+    partly_day = WEATHER_ICONS_NO_RAIN["partly_day"]
+    partly_night = WEATHER_ICONS_NO_RAIN["partly_night"]
+    cloudy = WEATHER_ICONS_NO_RAIN["cloudy"]
+    to_float = _to_float
+    day = is_day
+
+    icons: List[str] = []
+    append = icons.append
+    for cc, p, dt in zip(cloudcover_pct, precipitation_mm, times):
+        p = to_float(p)
+        dayflag = day(dt)
+
+        if p > 0:
+            if p <= light_max:
+                append("🌦️" if dayflag else "🌧️")
+            elif p <= moderate_max:
+                append("🌧️")
+            else:
+                append("⛈️")
+            continue
+
+        cc = to_float(cc)
+        if cc <= clear_max:
+            append(clear_day if dayflag else clear_night)
+        elif cc <= partly_max:
+            append(partly_day if dayflag else partly_night)
+        else:
+            append(cloudy)
 
-    if cc <= CLEAR_MAX:
-        return WEATHER_ICONS_NO_RAIN["clear_day"] if dayflag else WEATHER_ICONS_NO_RAIN["clear_night"]
-    elif cc <= PARTLY_MAX:
-        return WEATHER_ICONS_NO_RAIN["partly_day"] if dayflag else WEATHER_ICONS_NO_RAIN["partly_night"]
-    return WEATHER_ICONS_NO_RAIN["cloudy"]
+    return icons
 
 
 def _hex_to_rgb(h: str) -> Tuple[int, int, int]:
-    h = h.lstrip("#")
-    return int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
+    n = int(h.lstrip("#"), 16)
+    return (n >> 16) & 0xFF, (n >> 8) & 0xFF, n & 0xFF
 
 
 def _rgb_to_hex(r: int, g: int, b: int) -> str:
-    return f"#{r:02X}{g:02X}{b:02X}"
+    return f"#{(r << 16) | (g << 8) | b:06X}"
 
 
 def _clamp01(x: float) -> float:
@@ -162,12 +227,7 @@ def _lerp_color(c0: str, c1: str, t: float) -> str:
     )
 
 
-def precip_bg_color(p_mm: float) -> str:
-    p = max(0.0, _to_float(p_mm))
-    if p >= SCALE_MAX_MM:
-        return VIOLET
-
-    t = p / SCALE_MAX_MM
+def _precip_gradient_color(t: float) -> str:
     r0, g0, b0 = _hex_to_rgb(SKYBLUE)
     r1, g1, b1 = _hex_to_rgb(VIOLET)
 
@@ -178,6 +238,37 @@ def precip_bg_color(p_mm: float) -> str:
     )
 
 
+# SKYBLUE -> VIOLET in 256 steps over [0, SCALE_MAX_MM); built once at import
+_PRECIP_BG_LUT: List[str] = [_precip_gradient_color(i / 255.0) for i in range(256)]
+
+
+def precip_bg_color(p_mm: float) -> str:
+    p = max(0.0, _to_float(p_mm))
+    if p >= SCALE_MAX_MM:
+        return VIOLET
+    return _PRECIP_BG_LUT[int(p * (255.0 / SCALE_MAX_MM))]
+
+
+def _pop_band_color(pop_pct: int) -> str:
+    if pop_pct > 80:
+        return POP_RED       # > 80
+    elif pop_pct > 50:
+        return POP_YELLOW    # 51–80
+    elif pop_pct >= 30:
+        return POP_GREEN     # 30–50
+    return POP_WHITE         # < 30
+
+
+# Pill colour for every whole POP percentage 0..100; built once at import
+_POP_PILL_LUT: List[str] = [_pop_band_color(i) for i in range(101)]
+
+
+def pop_pill_color(pop_pct: int) -> str:
+    """Badge/pill color based on precipitation probability."""
+    i = int(pop_pct or 0)
+    return _POP_PILL_LUT[0 if i < 0 else 100 if i > 100 else i]
+
+
 def solar_bg_color(watts_m2: float) -> str:
     w = max(0.0, _to_float(watts_m2))
     t = min(w / SOLAR_SCALE_MAX_WM2, 1.0)
@@ -196,34 +287,50 @@ def solar_total_display(watts_m2: float) -> str:
     return f"{round(max(0.0, _to_float(watts_m2))):.0f}"
 
 
+TIME_BG_STOPS: List[Tuple[float, str]] = [
+    (0.0,  TC_6),
+    (4.5,  TC_5),
+    (6.5,  TC_4),
+    (8.5,  TC_3),
+    (11.0, TC_2),
+    (13.0, TC_1),
+    (15.5, TC_2),
+    (18.0, TC_3),
+    (19.5, TC_4),
+    (21.5, TC_5),
+    (24.0, TC_6),
+]
+
+
+_TIME_BG_STOP_HOURS: List[float] = [h for h, _ in TIME_BG_STOPS]
+
+
+def _time_gradient_color(h: float) -> str:
+    i = bisect_right(_TIME_BG_STOP_HOURS, h) - 1
+    i = min(max(i, 0), len(TIME_BG_STOPS) - 2)
+    (h0, c0), (h1, c1) = TIME_BG_STOPS[i], TIME_BG_STOPS[i + 1]
+    if h1 == h0:
+        return c1
+    return _lerp_color(c0, c1, (h - h0) / (h1 - h0))
+
+
+# One entry per minute of the day (1440); built once at import
+_TIME_BG_LUT: List[str] = [_time_gradient_color(m / 60.0) for m in range(24 * 60)]
+
+
 def time_bg_color(dt: datetime) -> str:
     """
     Smooth day/night gradient for Time column using your palette.
     """
-    h = dt.hour + (dt.minute / 60.0)
-
-    stops: List[Tuple[float, str]] = [
-        (0.0,  TC_6),
-        (4.5,  TC_5),
-        (6.5,  TC_4),
-        (8.5,  TC_3),
-        (11.0, TC_2),
-        (13.0, TC_1),
-        (15.5, TC_2),
-        (18.0, TC_3),
-        (19.5, TC_4),
-        (21.5, TC_5),
-        (24.0, TC_6),
-    ]
+    return _TIME_BG_LUT[dt.hour * 60 + dt.minute]
 
-    for (h0, c0), (h1, c1) in zip(stops, stops[1:]):
-        if h0 <= h <= h1:
-            if h1 == h0:
-                return c1
-            t = (h - h0) / (h1 - h0)
-            return _lerp_color(c0, c1, t)
 
-    return TC_6
+def day_window(times: List[datetime], day: date) -> Tuple[int, int]:
+    """Index range [start, end) covering `day` in a sorted hourly time grid."""
+    day_start = datetime.combine(day, datetime.min.time())
+    start = bisect_left(times, day_start)
+    end = bisect_left(times, day_start + timedelta(days=1), start)
+    return start, end
 
 
 def hour_label(dt: datetime) -> str:
@@ -234,46 +341,81 @@ def place_label_from_query(q: str) -> str:
     return q.split(",")[0].strip()
 
 
-def read_places_file(path: str, list_id: Optional[str] = None) -> Tuple[List[Place], List[Dict[str, str]], str]:
-    if not os.path.exists(path):
-        raise FileNotFoundError(path)
-
-    with open(path, encoding="utf-8") as f:
-        data = json.load(f)
-
+def parse_places_data(data: Dict[str, object], path: str) -> Tuple[str, Dict[str, List[Place]], List[Dict[str, str]]]:
+    """
+    (default_list_id, places by list id, lists_info) from a places file's JSON.
+    lists_info keeps file order; its first entry is the fallback list.
+    """
     default_list_id = data.get("default_list", "")
     lists_data = data.get("lists", [])
 
     if not lists_data:
         raise ValueError(f"No lists found in {path}.")
 
+    places_by_list: Dict[str, List[Place]] = {}
+    for lst in lists_data:
+        places_by_list.setdefault(
+            lst["id"],
+            [
+                Place(
+                    label=p["label"],
+                    query=p["label"],
+                    lat=float(p["lat"]),
+                    lon=float(p["lon"]),
+                )
+                for p in lst.get("places", [])
+            ],
+        )
+
+    lists_info = [{"id": lst["id"], "name": lst["name"]} for lst in lists_data]
+
+    return default_list_id, places_by_list, lists_info
+
+
+def select_places_list(
+        parsed: Tuple[str, Dict[str, List[Place]], List[Dict[str, str]]],
+        list_id: Optional[str] = None,
+    ) -> Tuple[List[Place], List[Dict[str, str]], str]:
+    default_list_id, places_by_list, lists_info = parsed
+
     if list_id is None:
         list_id = default_list_id
 
-    selected_list = next((lst for lst in lists_data if lst["id"] == list_id), None)
-    if selected_list is None:
-        selected_list = lists_data[0]
-        list_id = selected_list["id"]
-
-    places: List[Place] = []
-    for p in selected_list.get("places", []):
-        places.append(
-            Place(
-                label=p["label"],
-                query=p["label"],
-                lat=float(p["lat"]),
-                lon=float(p["lon"]),
-            )
-        )
+    if list_id not in places_by_list:
+        list_id = lists_info[0]["id"]
 
-    lists_info = [{"id": lst["id"], "name": lst["name"]} for lst in lists_data]
+    return places_by_list[list_id], lists_info, list_id
+
+
+# (path, mtime_ns, size) -> parse_places_data() result; one version per path
+_PLACES_MEMO: Dict[Tuple[str, int, int], Tuple[str, Dict[str, List[Place]], List[Dict[str, str]]]] = {}
+_PLACES_MEMO_LOCK = threading.Lock()
 
-    return places, lists_info, list_id
 
+def places_signature(st: os.stat_result, list_id: str) -> str:
+    return f"{st.st_mtime_ns}:{st.st_size}:{list_id}"
 
-def places_signature(path: str, list_id: str) -> str:
+
+def read_places_file_cached(path: str, list_id: Optional[str] = None) -> Tuple[List[Place], List[Dict[str, str]], str, str]:
+    """
+    (places, lists_info, active_list_id, places signature) for list_id, falling
+    back to the file's default list and then its first list. One os.stat per
+    call; the file is re-parsed only when its mtime or size changes.
+    """
     st = os.stat(path)
-    return f"{int(st.st_mtime)}:{st.st_size}:{list_id}"
+    key = (path, st.st_mtime_ns, st.st_size)
+    parsed = _PLACES_MEMO.get(key)
+    if parsed is None:
+        with open(path, encoding="utf-8") as f:
+            parsed = parse_places_data(json.load(f), path)
+        with _PLACES_MEMO_LOCK:
+            # Entries for older versions of the file can never match again
+            for stale in [k for k in _PLACES_MEMO if k[0] == path and k != key]:
+                _PLACES_MEMO.pop(stale, None)
+            _PLACES_MEMO[key] = parsed
+
+    places, lists_info, active_list_id = select_places_list(parsed, list_id)
+    return places, lists_info, active_list_id, places_signature(st, active_list_id)
 
 
 def read_config_file(path: str) -> Dict[str, object]:
@@ -297,16 +439,28 @@ def read_sites_file(path: str) -> List[Dict[str, object]]:
     return sites if isinstance(sites, list) else []
 
 
+@lru_cache(maxsize=16)
+def _zoneinfo(tz_name: str):
+    return ZoneInfo(tz_name)
+
+
 def safe_now_date_in_tz(tz_name: str) -> date:
     if ZoneInfo is None:
         return datetime.now().date()
 
     try:
-        return datetime.now(ZoneInfo(tz_name)).date()
+        return datetime.now(_zoneinfo(tz_name)).date()
     except Exception:
         return datetime.now().date()
 
 
+def _parse_om_time(s: str) -> datetime:
+    """Parses Open-Meteo's naive "YYYY-MM-DDTHH:MM" without going through fromisoformat."""
+    if len(s) != 16:
+        return datetime.fromisoformat(s)
+    return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]))
+
+
 def build_url(base_params: Dict[str, str], new_date: Optional[date]) -> str:
     params = dict(base_params)
     if new_date is None:
@@ -349,10 +503,17 @@ def nice_solar_axis_max(max_kwh: float, step: int = 25) -> int:
 
 # ---------------- CLIENT ----------------
 
+class ForecastBatchError(ValueError):
+    """A multi-coordinate response did not hold one forecast per coordinate."""
+
+
 class OpenMeteoClient:
     def __init__(self, timeout: int = 20):
         self.timeout = timeout
         self.session = requests.Session()
+        # Pool sized for the per-place fan-out in hourly_forecast_each()
+        adapter = HTTPAdapter(pool_connections=MAX_FORECAST_WORKERS, pool_maxsize=MAX_FORECAST_WORKERS)
+        self.session.mount("https://", adapter)
 
     def geocode(self, query: str, country_code: Optional[str]) -> Optional[Place]:
         name_only = query.split(",")[0].strip()
@@ -372,7 +533,7 @@ class OpenMeteoClient:
             timeout=self.timeout,
         )
         r.raise_for_status()
-        results = r.json().get("results") or []
+        results = _json_loads(r.content).get("results") or []
         if not results:
             return None
 
@@ -386,9 +547,19 @@ class OpenMeteoClient:
         )
 
     def hourly_forecast(self, lat: float, lon: float, tz: str, model: str):
+        return self.hourly_forecast_many([lat], [lon], tz, model)[0]
+
+    def hourly_forecast_many(self, lats: List[float], lons: List[float], tz: str, model: str):
+        """
+        Fetches hourly forecasts for several coordinates in one request.
+
+        Open-Meteo accepts comma-separated latitude/longitude lists and answers
+        with a JSON list (one block per coordinate, same order). A single
+        coordinate still comes back as a plain object.
+        """
         params = {
-            "latitude": lat,
-            "longitude": lon,
+            "latitude": ",".join(str(lat) for lat in lats),
+            "longitude": ",".join(str(lon) for lon in lons),
             "hourly": "precipitation,precipitation_probability,cloudcover,shortwave_radiation",
             "timezone": tz,
             "forecast_days": 7,
@@ -400,27 +571,118 @@ class OpenMeteoClient:
             timeout=self.timeout,
         )
         r.raise_for_status()
-        h = r.json()["hourly"]
-        return {
-            "time": [datetime.fromisoformat(t) for t in h["time"]],
-            "precip": h["precipitation"],
-            "pop": h.get("precipitation_probability") or [0] * len(h["time"]),
-            "cloud": h["cloudcover"],
-            "solar": h.get("shortwave_radiation") or [0] * len(h["time"]),
-        }
+        data = _json_loads(r.content)
+        blocks = data if isinstance(data, list) else [data]
+
+        # Every location shares the same tz, so the time grid is normally
+        # identical: parse it once and reuse the list for all places.
+        parsed_times: Dict[Tuple[str, ...], List[datetime]] = {}
+
+        forecasts = []
+        for block in blocks:
+            h = block["hourly"]
+            raw_times = tuple(h["time"])
+            times = parsed_times.get(raw_times)
+            if times is None:
+                times = [_parse_om_time(t) for t in raw_times]
+                parsed_times[raw_times] = times
+
+            forecasts.append(
+                {
+                    "time": times,
+                    "precip": h["precipitation"],
+                    "pop": h.get("precipitation_probability") or [0] * len(times),
+                    "cloud": h["cloudcover"],
+                    "solar": h.get("shortwave_radiation") or [0] * len(times),
+                }
+            )
+
+        if len(forecasts) != len(lats):
+            raise ForecastBatchError(f"Expected {len(lats)} forecasts, got {len(forecasts)}.")
+
+        return forecasts
+
+    def hourly_forecast_each(self, lats: List[float], lons: List[float], tz: str, model: str):
+        """
+        Same result as hourly_forecast_many(), but one request per coordinate,
+        issued concurrently. Fallback for when a multi-coordinate request is
+        rejected.
+        """
+        workers = max(1, min(MAX_FORECAST_WORKERS, len(lats)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self.hourly_forecast, lat, lon, tz, model)
+                for lat, lon in zip(lats, lons)
+            ]
+            return [f.result() for f in futures]
 
 
 # ---------------- CACHE (SQLite) ----------------
 
+# In-process layer in front of SQLite: cache key -> (html_gz, created_at, expires_at on time.monotonic())
+_HTML_MEMO: Dict[Tuple[str, str, str, str, str, str], Tuple[bytes, int, float]] = {}
+_HTML_MEMO_LOCK = threading.Lock()
+
+
+def _memo_get(key: Tuple[str, str, str, str, str, str]) -> Optional[Tuple[bytes, int]]:
+    with _HTML_MEMO_LOCK:
+        entry = _HTML_MEMO.get(key)
+        if entry is None:
+            return None
+        html_gz, created_at, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del _HTML_MEMO[key]
+            return None
+        return html_gz, created_at
+
+
+def _memo_put(key: Tuple[str, str, str, str, str, str], html_gz: bytes, created_at: int, ttl_seconds: float) -> None:
+    with _HTML_MEMO_LOCK:
+        _HTML_MEMO.pop(key, None)
+        _HTML_MEMO[key] = (html_gz, created_at, time.monotonic() + ttl_seconds)
+        # dicts keep insertion order: drop the oldest entries first
+        while len(_HTML_MEMO) > HTML_MEMO_MAX_ENTRIES:
+            del _HTML_MEMO[next(iter(_HTML_MEMO))]
+
+
+_cache_tls = threading.local()
+
+
 def cache_connect() -> sqlite3.Connection:
-    conn = sqlite3.connect(CACHE_DB_PATH, timeout=10)
+    """
+    Returns this thread's cache connection, opening it on first use.
+
+    The connection is tagged with the pid so a gunicorn worker never reuses
+    one inherited from the master (cache_init() runs at import, before fork).
+    """
+    conn = getattr(_cache_tls, "conn", None)
+    if conn is not None and _cache_tls.pid == os.getpid():
+        return conn
+
+    conn = sqlite3.connect(CACHE_DB_PATH, timeout=10, check_same_thread=False)
     conn.execute("PRAGMA journal_mode=WAL;")
     conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA mmap_size=30000000;")
+    conn.execute("PRAGMA cache_size=-8000;")  # 8 MB page cache
+    conn.execute("PRAGMA wal_autocheckpoint=1000;")
+    _cache_tls.conn = conn
+    _cache_tls.pid = os.getpid()
     return conn
 
 
 def cache_init() -> None:
+    try:
+        os.makedirs(CACHE_HTML_DIR, exist_ok=True)
+    except OSError:
+        pass  # pages are then served from the SQLite blobs only
     with cache_connect() as conn:
+        columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(rain_cache)")}
+        if columns and (columns.get("html") != "BLOB" or columns.get("created_at") != "INTEGER"):
+            # Older layout (html TEXT / created_at TEXT); it's only a cache, so start over.
+            # IF EXISTS: every gunicorn worker runs this at import, and another may have dropped it.
+            conn.execute("DROP TABLE IF EXISTS rain_cache")
+
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS rain_cache (
@@ -430,59 +692,133 @@ def cache_init() -> None:
               country     TEXT NOT NULL,
               model       TEXT NOT NULL,
               places_sig  TEXT NOT NULL,
-              html        TEXT NOT NULL,
-              created_at  TEXT NOT NULL,
+              html        BLOB NOT NULL,
+              created_at  INTEGER NOT NULL,  -- unix epoch seconds (UTC)
               PRIMARY KEY (query_date, target_date, tz, country, model, places_sig)
             )
             """
         )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_rain_cache_created_at ON rain_cache (created_at)")
     cache_prune()
 
 
-def cache_prune() -> None:
-    """Deletes cache rows older than CACHE_RETENTION_DAYS (based on created_at, UTC)."""
-    with cache_connect() as conn:
-        conn.execute(
-            """
-            DELETE FROM rain_cache
-            WHERE created_at < datetime('now', ?)
-            """,
-            (f"-{CACHE_RETENTION_DAYS} days",),
-        )
+def _cache_delete_expired(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        DELETE FROM rain_cache
+        WHERE created_at < ?
+        """,
+        (int(time.time()) - CACHE_RETENTION_DAYS * 24 * 60 * 60,),
+    )
+
+
+def _cache_delete_expired_files() -> None:
+    cutoff = time.time() - CACHE_RETENTION_DAYS * 24 * 60 * 60
+    try:
+        entries = list(os.scandir(CACHE_HTML_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.name.endswith(".html.gz") and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass  # another worker got there first, or the directory is read-only
+
+
+_last_file_sweep = 0.0
+_FILE_SWEEP_LOCK = threading.Lock()
 
 
-def cache_get(query_date: str, target_date: str, tz: str, country: str, model: str, places_sig: str) -> Optional[str]:
+def _cache_sweep_files_periodically() -> None:
+    """_cache_delete_expired_files(), at most once per CACHE_FILE_SWEEP_SECONDS per process."""
+    global _last_file_sweep
+    now = time.time()
+    with _FILE_SWEEP_LOCK:
+        if now - _last_file_sweep < CACHE_FILE_SWEEP_SECONDS:
+            return
+        _last_file_sweep = now
+    _cache_delete_expired_files()
+
+
+def cache_prune() -> None:
+    """Deletes cache rows (and page files) older than CACHE_RETENTION_DAYS (based on created_at, UTC)."""
     with cache_connect() as conn:
-        row = conn.execute(
-            """
-            SELECT html, created_at
-            FROM rain_cache
-            WHERE query_date=? AND target_date=? AND tz=? AND country=? AND model=? AND places_sig=?
-            """,
-            (query_date, target_date, tz, country, model, places_sig),
-        ).fetchone()
+        _cache_delete_expired(conn)
+    _cache_delete_expired_files()
 
-        if not row:
-            return None
 
-        html, created_at = row
+def cache_file_path(query_date: str, target_date: str, tz: str, country: str, model: str, places_sig: str, created_at: int) -> str:
+    # created_at is part of the name, so a file only ever holds the body its ETag describes
+    key = f"{query_date}|{target_date}|{tz}|{country}|{model}|{places_sig}|{created_at}"
+    return os.path.join(CACHE_HTML_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".html.gz")
 
-        # created_at stored as UTC "YYYY-MM-DD HH:MM:SS"
+
+def _cache_write_file(path: str, html_gz: bytes) -> None:
+    # Write then rename, so a concurrent send_file never sees a partial page
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(html_gz)
+        os.replace(tmp_path, path)
+    except OSError:
+        # The file is only a fast path; cached_page_response() falls back to the row's blob
         try:
-            created_dt = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S")
-        except Exception:
-            # If parsing fails, treat as expired to force refresh
-            return None
+            os.remove(tmp_path)
+        except OSError:
+            pass
 
-        age = datetime.utcnow() - created_dt
-        if age.total_seconds() > CACHE_TTL_SECONDS:
-            return None
 
-        return html
+def gzip_html(html: str) -> bytes:
+    return gzip.compress(html.encode("utf-8"), compresslevel=CACHE_GZIP_LEVEL)
+
+
+def cache_get(query_date: str, target_date: str, tz: str, country: str, model: str, places_sig: str) -> Optional[Tuple[bytes, int]]:
+    """Returns (gzip-compressed page, created_at) for a fresh cache row, or None."""
+    key = (query_date, target_date, tz, country, model, places_sig)
+    entry = _memo_get(key)
+    if entry is not None:
+        return entry
+
+    now = int(time.time())
+    row = cache_connect().execute(
+        """
+        SELECT html, created_at
+        FROM rain_cache
+        WHERE query_date=? AND target_date=? AND tz=? AND country=? AND model=? AND places_sig=?
+          AND created_at > ?
+        """,
+        (*key, now - CACHE_TTL_SECONDS),
+    ).fetchone()
+
+    if not row:
+        return None
+
+    html_gz, created_at = row
+    remaining = created_at + CACHE_TTL_SECONDS - now
+    _memo_put(key, html_gz, created_at, remaining)
+    return html_gz, created_at
 
 
-def cache_put(query_date: str, target_date: str, tz: str, country: str, model: str, places_sig: str, html: str) -> None:
+def cache_put(query_date: str, target_date: str, tz: str, country: str, model: str, places_sig: str, html_gz: bytes) -> int:
+    """
+    Writes the page file served by send_file, then stores the row and prunes old
+    rows in the same transaction (one commit per cache miss). The file of the row it
+    replaces is removed. Returns the row's created_at.
+    """
+    key = (query_date, target_date, tz, country, model, places_sig)
+    created_at = int(time.time())
+    _cache_write_file(cache_file_path(*key, created_at), html_gz)
     with cache_connect() as conn:
+        _cache_delete_expired(conn)
+        old = conn.execute(
+            """
+            SELECT created_at
+            FROM rain_cache
+            WHERE query_date=? AND target_date=? AND tz=? AND country=? AND model=? AND places_sig=?
+            """,
+            key,
+        ).fetchone()
         conn.execute(
             """
             INSERT OR REPLACE INTO rain_cache
@@ -497,15 +833,53 @@ def cache_put(query_date: str, target_date: str, tz: str, country: str, model: s
                 country,
                 model,
                 places_sig,
-                html,
-                datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+                html_gz,
+                created_at,
             ),
         )
+    _memo_put(key, html_gz, created_at, CACHE_TTL_SECONDS)
+
+    # The replaced row's file can never be served again
+    if old is not None and old[0] != created_at:
+        try:
+            os.remove(cache_file_path(*key, old[0]))
+        except OSError:
+            pass
+    _cache_sweep_files_periodically()
+    return created_at
 
 
 # ---------------- HTML RENDER ----------------
 
-def render_html(
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(APP_DIR, "templates")
+STATIC_DIR = os.path.join(APP_DIR, "static")
+
+
+def _static_version(name: str) -> str:
+    """Content hash used as ?v= on static URLs, so a changed file gets a new URL."""
+    with open(os.path.join(STATIC_DIR, name), "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+
+STATIC_VERSIONS: Dict[str, str] = {name: _static_version(name) for name in ("matrix.css", "matrix.js")}
+
+# Compiled once at import; auto_reload=False skips the per-render mtime check
+_jinja_env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    auto_reload=False,
+    autoescape=True,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_jinja_env.globals["static_versions"] = STATIC_VERSIONS
+MATRIX_TEMPLATE = _jinja_env.get_template("matrix.html.j2")
+
+# Template events per streamed chunk (roughly 18 bytes each)
+MATRIX_STREAM_BUFFER_EVENTS = 256
+
+
+def matrix_context(
         target_date: date,
         min_date: date,
         max_date: date,
@@ -515,13 +889,18 @@ def render_html(
         lists_info: List[Dict[str, str]],
         active_list_id: str,
         time_index: List[datetime],
-        cell_map: Dict[str, Dict[str, Tuple[str, float, int, float]]],  # icon, precip_mm, pop_pct, solar_wm2
+        rows: List[Tuple[Tuple[str, float, int, float], ...]],  # rows[hour_idx][place_idx] = (icon, precip_mm, pop_pct, solar_wm2)
         from_cache: bool,
         nocache: bool,
         base_params: Dict[str, str],
         view: str,
-    ) -> str:
+    ) -> Dict[str, object]:
     """
+    Template context for templates/matrix.html.j2.
+
+    Every colour and display string is worked out here; the template only lays
+    them out. Table rows are formatted lazily, as the template reaches them.
+
     Updated pill/badge colors (POP):
       - < 30%     -> white
       - 30–50%    -> light green
@@ -534,42 +913,32 @@ def render_html(
     table_id = "solarTable" if is_solar_view else "rainTable"
     download_prefix = "solar-matrix" if is_solar_view else "rain-matrix"
 
-    prev_date = target_date - timedelta(days=1)
-    next_date = target_date + timedelta(days=1)
-    prev_ok = prev_date >= min_date
-    next_ok = next_date <= max_date
-
-    date_buttons = []
+    date_chips = []
     d = min_date
     while d <= max_date:
-        active = "active" if d == target_date else ""
-        href = build_url(base_params, d)
-        label = d.strftime("%a %b %d")
-        date_buttons.append(f"<a class='dchip {active}' href='{href}'>{label}</a>")
+        date_chips.append(
+            {"href": build_url(base_params, d), "label": d.strftime("%a %b %d"), "active": d == target_date}
+        )
         d += timedelta(days=1)
 
-    list_buttons = []
+    list_chips = []
     for l_info in lists_info:
-        active = "active" if l_info["id"] == active_list_id else ""
-
         # Build URL for switching list but maintaining date
         l_params = dict(base_params)
         l_params["list"] = l_info["id"]
         # keep the same target_date
         l_href = build_url(l_params, target_date)
 
-        list_buttons.append(f"<a class='dchip {active}' href='{l_href}'>{l_info['name']}</a>")
+        list_chips.append({"href": l_href, "label": l_info["name"], "active": l_info["id"] == active_list_id})
 
-    view_buttons = []
+    view_chips = []
     for view_id, label in [("rain", "Rain"), ("solar", "Solar")]:
-        active = "active" if view_id == view else ""
         v_params = dict(base_params)
         if view_id == "solar":
             v_params["view"] = "solar"
         else:
             v_params.pop("view", None)
-        v_href = build_url(v_params, target_date)
-        view_buttons.append(f"<a class='dchip {active}' href='{v_href}'>{label}</a>")
+        view_chips.append({"href": build_url(v_params, target_date), "label": label, "active": view_id == view})
 
     forecast_label = target_date.strftime("%d-%b-%y").upper()
 
@@ -581,48 +950,15 @@ def render_html(
         (5.0, "5.0 mm - malakas na ulan"),
         (SCALE_MAX_MM, f"{SCALE_MAX_MM:.1f} mm+ - buhos na ulan"),
     ]
-    precip_legend_items = "".join(
-        f"""
-        <div class="legend-item">
-          <span class="legend-rect" style="background:{precip_bg_color(mm)}"></span>
-          <span class="legend-text">{label}</span>
-        </div>
-        """
-        for mm, label in precip_samples
-    )
-
-    # Updated POP (pill/badge) colors + legend
-    POP_WHITE = "#FFFFFF"  # < 30
-    POP_GREEN = "#D1E7DD"  # 30–50 (light green)
-    POP_YELLOW = "#FFF3CD" # 51–80
-    POP_RED = "#F8D7DA"    # > 80
-
-    pill_legend_items = f"""
-      <div class="legend-item">
-        <span class="legend-pill" style="background:{POP_WHITE}">
-          <span class="legend-pill-dot"></span>
-          POP &lt; 30%
-        </span>malabong umulan
-      </div>
-      <div class="legend-item">
-        <span class="legend-pill" style="background:{POP_GREEN}">
-          <span class="legend-pill-dot"></span>
-          POP 30–50%
-        </span>baka umulan
-      </div>
-      <div class="legend-item">
-        <span class="legend-pill" style="background:{POP_YELLOW}">
-          <span class="legend-pill-dot"></span>
-          POP 51–80%
-        </span>maghanda sa posibleng ulan
-      </div>
-      <div class="legend-item">
-        <span class="legend-pill" style="background:{POP_RED}">
-          <span class="legend-pill-dot"></span>
-          POP &gt; 80%
-        </span>asahang uulan
-      </div>
-    """
+    precip_legend = [(precip_bg_color(mm), label) for mm, label in precip_samples]
+
+    # Updated POP (pill/badge) legend
+    pop_legend = [
+        (POP_WHITE, "POP < 30%", "malabong umulan"),
+        (POP_GREEN, "POP 30–50%", "baka umulan"),
+        (POP_YELLOW, "POP 51–80%", "maghanda sa posibleng ulan"),
+        (POP_RED, "POP > 80%", "asahang uulan"),
+    ]
 
     solar_samples = [
         (0.0, "0 W/m² - no usable sun"),
@@ -631,448 +967,63 @@ def render_html(
         (750.0, "750 W/m² - strong sun"),
         (SOLAR_SCALE_MAX_WM2, f"{SOLAR_SCALE_MAX_WM2:.0f} W/m² - excellent sun"),
     ]
-    solar_legend_items = "".join(
-        f"""
-        <div class="legend-item">
-          <span class="legend-rect" style="background:{solar_bg_color(wm2)}"></span>
-          <span class="legend-text">{label}</span>
-        </div>
-        """
-        for wm2, label in solar_samples
-    )
-
-    if is_solar_view:
-        legend_html = f"""
-<div class="legend" aria-label="Legend">
-  <h3>Legend</h3>
-  <div class="legend-grid">
-    <div class="legend-block">
-      <div style="font-size:13px;font-weight:900;margin-bottom:8px;">Solar Irradiance</div>
-      <div class="legend-items">
-        {solar_legend_items}
-      </div>
-    </div>
-  </div>
-</div>
-"""
-    else:
-        legend_html = f"""
-<div class="legend" aria-label="Legend">
-  <h3>Legend</h3>
-  <div class="legend-grid">
-    <div class="legend-block">
-      <div style="font-size:13px;font-weight:900;margin-bottom:8px;">Chance of Rain</div>
-      <div class="legend-items">
-        {pill_legend_items}
-      </div>
-    </div>
+    solar_legend = [(solar_bg_color(wm2), label) for wm2, label in solar_samples]
 
-    <div class="legend-block">
-      <div style="font-size:13px;font-weight:900;margin-bottom:8px;">Rain Intensity</div>
-      <div class="legend-items">
-        {precip_legend_items}
-      </div>
-    </div>
-  </div>
-</div>
-"""
-
-    html = f"""<!doctype html>
-<html>
-<head>
-<meta charset="utf-8">
-<meta name="viewport" content="width=device-width,initial-scale=1" />
-<title>{title}</title>
-
-<style>
-body {{ font-family: Segoe UI, Arial, sans-serif; margin:16px; }}
-
-.navbar {{
-  display:flex;
-  gap:12px;
-  align-items:center;
-  flex-wrap:wrap;
-  margin: 6px 0 14px;
-}}
-
-.btn {{
-  display:inline-block;
-  padding:7px 14px;
-  border-radius:10px;
-  background:#111;
-  color:#fff;
-  text-decoration:none;
-  font-weight:700;
-  font-size:13px;
-}}
-
-.dchips {{
-  display:flex;
-  gap:8px;
-  flex-wrap:wrap;
-}}
-
-.dchip {{
-  display:inline-block;
-  padding:6px 10px;
-  border-radius:999px;
-  background:#fff;
-  border:1px solid #ddd;
-  text-decoration:none;
-  color:#111;
-  font-weight:700;
-  font-size:13px;
-}}
-
-.dchip.active {{
-  border-color:#111;
-  box-shadow:0 1px 2px rgba(0,0,0,15);
-}}
-
-/* --- MOBILE-FRIENDLY TABLE: allow horizontal scroll instead of compressing --- */
-.table-wrap {{
-  overflow-x:auto;
-  -webkit-overflow-scrolling:touch;
-  border:1px solid #ddd;
-  border-radius:12px;
-  background:#fff;
-}}
-
-table {{
-  width:max-content;
-  min-width:100%;
-  table-layout:fixed;
-  border-collapse:separate;
-  border-spacing:0;
-  background:#ffffff;
-}}
-
-th, td {{ border:1px solid #ddd; padding:8px; text-align:center; }}
-
-th {{
-  background:#f5f5f5;
-  position:sticky;
-  top:0;
-  z-index:3;
-}}
-
-th.timehead {{
-  left:0;
-  z-index:4;
-  position:sticky;
-}}
-
-td.time {{
-  width:90px;
-  position:sticky;
-  left:0;
-  z-index:2;
-  font-weight:700;
-}}
-
-.time-pill {{
-  display:inline-block;
-  padding:4px 10px;
-  border-radius:999px;
-  background:#fff;
-  font-size:13px;
-  font-weight:800;
-  color:#111;
-  box-shadow:0 1px 2px rgba(0,0,0,20);
-}}
-
-.pill {{
-  display:inline-block;
-  padding:4px 8px;
-  background:#fff;
-  border-radius:999px;
-  box-shadow:0 1px 2px rgba(0,0,0,18);
-  color:#111;
-  line-height:1;
-  white-space:nowrap;
-}}
-
-.pill .icon {{
-  display:inline-block;
-  vertical-align:middle;
-  font-size:16px;
-  margin-right:6px;
-}}
-
-.pill .val {{
-  display:inline-block;
-  vertical-align:middle;
-  font-size:13px;
-  font-weight:700;
-  color:#111;
-}}
-
-.pill .pop {{
-  display:inline-block;
-  vertical-align:middle;
-  font-size:11px;
-  font-weight:800;
-  margin-left:6px;
-  padding:2px 6px;
-  border-radius:999px;
-  background:rgba(0,0,0,0.06);
-  color:#111;
-}}
-
-.solar-val {{
-  display:inline-block;
-  min-width:56px;
-  padding:4px 8px;
-  border-radius:999px;
-  background:rgba(255,255,255,0.86);
-  box-shadow:0 1px 2px rgba(0,0,0,18);
-  color:#111;
-  font-size:13px;
-  font-weight:900;
-  line-height:1;
-}}
-
-.total-label {{
-  background:#111827 !important;
-  color:#fff;
-}}
-
-.total-pill {{
-  display:inline-block;
-  min-width:64px;
-  padding:5px 10px;
-  border-radius:999px;
-  background:#111827;
-  color:#fff;
-  box-shadow:0 1px 2px rgba(0,0,0,22);
-  font-size:13px;
-  font-weight:900;
-  line-height:1;
-}}
-
-/* Give each place column a minimum width so it stays readable */
-th:not(.timehead), td:not(.time) {{
-  min-width:92px;
-}}
-
-@media (max-width: 520px) {{
-  body {{ margin:12px; }}
-  th, td {{ padding:6px; }}
-  th:not(.timehead), td:not(.time) {{ min-width:86px; }}
-  .pill {{ padding:3px 7px; }}
-  .pill .icon {{ font-size:14px; margin-right:5px; }}
-  .pill .val {{ font-size:12px; }}
-  .time-pill {{ font-size:12px; padding:3px 9px; }}
-  .pill .pop {{ font-size:10px; padding:2px 5px; }}
-  .solar-val {{ font-size:12px; min-width:50px; padding:3px 7px; }}
-  .total-pill {{ font-size:12px; min-width:56px; padding:4px 8px; }}
-}}
-
-/* ---------- LEGEND ---------- */
-.legend {{
-  margin-top:14px;
-  padding:12px;
-  border:1px solid #ddd;
-  border-radius:12px;
-  background:#fff;
-}}
-
-.legend h3 {{
-  margin:0 0 8px;
-  font-size:14px;
-}}
-
-.legend-grid {{
-  display:flex;
-  flex-wrap:wrap;
-  gap:18px;
-}}
-
-.legend-block {{
-  min-width:220px;
-}}
-
-.legend-items {{
-  display:flex;
-  flex-direction:column;
-  gap:8px;
-}}
-
-.legend-item {{
-  display:flex;
-  align-items:center;
-  gap:10px;
-}}
-
-.legend-rect {{
-  width:34px;
-  height:18px;
-  border-radius:4px;
-  border:1px solid rgba(0,0,0,0.18);
-  box-shadow:0 1px 1px rgba(0,0,0,0.08);
-}}
-
-.legend-text {{
-  font-size:13px;
-  font-weight:700;
-  color:#111;
-}}
-
-.legend-pill {{
-  display:inline-flex;
-  align-items:center;
-  gap:8px;
-  padding:5px 10px;
-  border-radius:999px;
-  border:1px solid rgba(0,0,0,0.10);
-  box-shadow:0 1px 2px rgba(0,0,0,0.12);
-  font-size:13px;
-  font-weight:800;
-  color:#111;
-}}
-
-.legend-pill-dot {{
-  width:10px;
-  height:10px;
-  border-radius:999px;
-  background:rgba(0,0,0,0.18);
-}}
-</style>
-</head>
-
-<body>
-
-<h2 style="margin:0 0 6px;">{title}</h2>
-
-<div class="navbar">
-  <div class="dchips">
-    {''.join(list_buttons)}
-  </div>
-</div>
-
-<div class="navbar">
-  <div class="dchips">
-    {''.join(date_buttons)}
-  </div>
-
-  <div class="dchips">
-    {''.join(view_buttons)}
-  </div>
-
-  <a href="/solar-site" class="btn">Site Production</a>
-  <a href="#" class="btn" id="downloadBtn">Download JPG</a>
-</div>
-
-<div class="table-wrap">
-  <table id="{table_id}">
-    <tr>
-      <th class="timehead">{forecast_label}</th>
-      {''.join(f"<th>{p.label}</th>" for p in places)}
-    </tr>
-"""
-
-    for t in time_index:
-        hk = t.strftime("%I:00 %p")
-        tbg = time_bg_color(t)
-
-        html += (
-            f"<tr>"
-            f"<td class='time' style='background:{tbg}'>"
-            f"<span class='time-pill'>{hk}</span>"
-            f"</td>"
-        )
-
-        for p in places:
-            icon, precip, pop, solar = cell_map.get(p.label, {}).get(
-                t.strftime("%H:00"), ("—", 0.0, 0, 0.0)
-            )
+    # Loop invariants for the time x place grid below
+    cell_precip_bg = precip_bg_color
+    cell_pill_bg = pop_pill_color
+    cell_solar_bg = solar_bg_color
 
+    # (time_bg, time_label, cells) per row; cells are pre-formatted for the view
+    def iter_rows():
+        for t, row in zip(time_index, rows):
             if is_solar_view:
-                html += (
-                    f"<td style='background:{solar_bg_color(solar)}'>"
-                    f"<span class='solar-val'>{solar_display(solar)}</span>"
-                    f"</td>"
-                )
+                cells = [(cell_solar_bg(solar), solar_display(solar)) for _icon, _precip, _pop, solar in row]
             else:
-                bg = precip_bg_color(precip)
-                val = precip_display(precip)
-
-                # Updated badge/pill color based on precipitation probability
-                pop_i = int(pop or 0)
-                if pop_i > 80:
-                    pill_bg = POP_RED       # > 80
-                elif pop_i > 50:
-                    pill_bg = POP_YELLOW    # 51–80
-                elif pop_i >= 30:
-                    pill_bg = POP_GREEN     # 30–50
-                else:
-                    pill_bg = POP_WHITE     # < 30
-
-                html += (
-                    f"<td style='background:{bg}'>"
-                    f"<span class='pill' style='background:{pill_bg}'>"
-                    f"<span class='icon'>{icon}</span>"
-                    f"<span class='val'>{val}</span>"
-                    f"</span>"
-                    f"</td>"
-                )
+                cells = [
+                    (cell_precip_bg(precip), cell_pill_bg(pop), icon, precip_display(precip))
+                    for icon, precip, pop, _solar in row
+                ]
 
-        html += "</tr>"
+            yield time_bg_color(t), t.strftime("%I:00 %p"), cells
 
+    solar_totals = []
     if is_solar_view:
-        html += (
-            "<tr>"
-            "<td class='time total-label'>"
-            "<span class='time-pill'>TOTAL</span>"
-            "</td>"
-        )
+        solar_totals = [
+            solar_total_display(sum(row[place_idx][3] for row in rows))
+            for place_idx in range(len(places))
+        ]
 
-        for p in places:
-            total_solar = sum(
-                cell_map.get(p.label, {}).get(t.strftime("%H:00"), ("—", 0.0, 0, 0.0))[3]
-                for t in time_index
-            )
-            html += (
-                "<td class='total-cell'>"
-                f"<span class='total-pill'>{solar_total_display(total_solar)}</span>"
-                "</td>"
-            )
-
-        html += "</tr>"
-
-    html += f"""
-  </table>
-</div>
-
-<!-- LEGEND (after table) -->
-{legend_html}
-
-<script src="https://cdn.jsdelivr.net/npm/html2canvas@1.4.1/dist/html2canvas.min.js"></script>
-<script>
-document.getElementById("downloadBtn").addEventListener("click", function (e) {{
-  e.preventDefault();
+    return {
+        "title": title,
+        "table_id": table_id,
+        "download_prefix": download_prefix,
+        "is_solar_view": is_solar_view,
+        "list_chips": list_chips,
+        "date_chips": date_chips,
+        "view_chips": view_chips,
+        "forecast_label": forecast_label,
+        "places": places,
+        "rows": iter_rows(),
+        "solar_totals": solar_totals,
+        "pop_legend": pop_legend,
+        "precip_legend": precip_legend,
+        "solar_legend": solar_legend,
+    }
 
-  const table = document.getElementById("{table_id}");
 
-  html2canvas(table, {{
-    backgroundColor: "#ffffff",
-    scale: 2,
-    useCORS: true
-  }}).then(canvas => {{
-    const link = document.createElement("a");
-    const d = new Date().toISOString().slice(0,10);
+def render_html(ctx: Dict[str, object]) -> str:
+    return MATRIX_TEMPLATE.render(ctx)
 
-    link.download = `{download_prefix}-${{d}}.jpg`;
-    link.href = canvas.toDataURL("image/jpeg", 0.95);
-    link.click();
-  }});
-}});
-</script>
 
-</body>
-</html>
-"""
-    return html
+def iter_html(ctx: Dict[str, object]) -> Iterator[str]:
+    """
+    Streams the matrix page. Jinja emits one event per text node or
+    expression, so they are buffered into chunks of a few KB each.
+    """
+    stream = MATRIX_TEMPLATE.stream(ctx)
+    stream.enable_buffering(MATRIX_STREAM_BUFFER_EVENTS)
+    return stream
 
 
 def render_solar_site_html(
@@ -1772,9 +1723,66 @@ renderBatteryChart();
 
 # ---------------- FLASK APP ----------------
 
-app = Flask(__name__)
+app = Flask(__name__, static_folder=STATIC_DIR)
 cache_init()
 
+
+@app.after_request
+def static_cache_headers(resp: Response) -> Response:
+    # Only real files are versioned; a 404 must not be cached for a year
+    if resp.status_code in (200, 304) and request.path.startswith(f"{app.static_url_path}/"):
+        resp.headers["Cache-Control"] = f"public, max-age={STATIC_MAX_AGE_SECONDS}, immutable"
+    return resp
+
+
+def gzip_html_response(html_gz: bytes) -> Response:
+    """Sends a gzip_html() page as-is when the client accepts gzip, else inflated."""
+    if request.accept_encodings["gzip"]:
+        resp = Response(html_gz, mimetype="text/html")
+        resp.headers["Content-Encoding"] = "gzip"
+    else:
+        resp = Response(gzip.decompress(html_gz), mimetype="text/html")
+    resp.vary.add("Accept-Encoding")
+    return resp
+
+
+def page_etag(query_date: str, target_date: str, tz: str, country: str, model: str, places_sig: str, created_at: int) -> str:
+    # created_at changes whenever the cached page is rebuilt, so the tag does too
+    key = f"{query_date}|{target_date}|{tz}|{country}|{model}|{places_sig}|{created_at}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def cached_page_response(html_gz: bytes, etag: str, html_path: str) -> Response:
+    """
+    304 when the browser already holds this version of the page, else the page itself.
+
+    gzip clients get the page file through send_file (sendfile(2) under gunicorn);
+    html_gz covers everyone else and a missing file. The gzip body is a different
+    representation from the identity one, so it gets its own strong tag.
+    """
+    gzip_ok = bool(request.accept_encodings["gzip"])
+    if gzip_ok:
+        etag += "-gz"
+
+    resp: Optional[Response] = None
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+    elif gzip_ok:
+        try:
+            resp = send_file(html_path, mimetype="text/html", conditional=True, etag=etag)
+        except FileNotFoundError:
+            pass  # never written, or removed when a newer rebuild replaced the row
+        else:
+            resp.headers["Content-Encoding"] = "gzip"
+            resp.headers.pop("Content-Disposition", None)  # it names the hashed .html.gz file
+    if resp is None:
+        resp = gzip_html_response(html_gz)
+    resp.vary.add("Accept-Encoding")
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = f"private, max-age={BROWSER_MAX_AGE_SECONDS}"
+    return resp
+
+
 @app.get("/")
 def index():
     # Query params with sane defaults
@@ -1787,9 +1795,6 @@ def index():
     # Cache bypass
     nocache = request.args.get("nocache") == "1"
 
-    # Keep cache tidy
-    cache_prune()
-
     # "Today" is based on requested timezone
     qdate = safe_now_date_in_tz(tz)
     min_date = qdate
@@ -1814,8 +1819,8 @@ def index():
 
     # Places file (NEW: coordinates-based)
     try:
-        places, lists_info, active_list_id = read_places_file(DEFAULT_PLACES_FILE, list_id)
-        p_sig = f"{places_signature(DEFAULT_PLACES_FILE, active_list_id)}:{view}:{SOLAR_TOTAL_CACHE_VERSION}"
+        places, lists_info, active_list_id, places_sig = read_places_file_cached(DEFAULT_PLACES_FILE, list_id)
+        p_sig = f"{places_sig}:{view}:{SOLAR_TOTAL_CACHE_VERSION}"
     except FileNotFoundError:
         return Response(
             f"Missing places file: {DEFAULT_PLACES_FILE}\n"
@@ -1847,7 +1852,7 @@ def index():
 
     # Try cache first (unless nocache)
     if not nocache:
-        cached_html = cache_get(
+        cached = cache_get(
             query_date=qdate.isoformat(),
             target_date=target_date.isoformat(),
             tz=tz,
@@ -1855,8 +1860,11 @@ def index():
             model=model,
             places_sig=p_sig,
         )
-        if cached_html is not None:
-            return Response(cached_html, mimetype="text/html")
+        if cached is not None:
+            cached_html_gz, created_at = cached
+            etag = page_etag(qdate.isoformat(), target_date.isoformat(), tz, country, model, p_sig, created_at)
+            html_path = cache_file_path(qdate.isoformat(), target_date.isoformat(), tz, country, model, p_sig, created_at)
+            return cached_page_response(cached_html_gz, etag, html_path)
 
     # ---------------- LIVE BUILD ----------------
 
@@ -1867,33 +1875,51 @@ def index():
     time_index: List[datetime] = []
     seen_hours = set()
 
-    for p in places:
-        hourly = client.hourly_forecast(p.lat, p.lon, tz, model)
+    lats = [p.lat for p in places]
+    lons = [p.lon for p in places]
+    try:
+        forecasts = client.hourly_forecast_many(lats, lons, tz, model)
+    except (requests.HTTPError, ForecastBatchError) as e:
+        # Some models reject multi-coordinate requests (400) or answer them with
+        # the wrong shape; fetch per place instead. Anything else (429, 5xx) is real.
+        if isinstance(e, requests.HTTPError) and (e.response is None or e.response.status_code != 400):
+            raise
+        forecasts = client.hourly_forecast_each(lats, lons, tz, model)
+
+    for p, hourly in zip(places, forecasts):
         cells: Dict[str, Tuple[str, float, int, float]] = {}
 
-        for t, pr, pop, cc, solar in zip(
-            hourly["time"],
-            hourly["precip"],
-            hourly["pop"],
-            hourly["cloud"],
-            hourly["solar"],
+        # Only the target day's slice of the 7-day grid is needed
+        start, end = day_window(hourly["time"], target_date)
+        times = hourly["time"][start:end]
+        precips = hourly["precip"][start:end]
+        icons = weather_icons(hourly["cloud"][start:end], precips, times)
+
+        for t, icon, pr, pop, solar in zip(
+            times,
+            icons,
+            precips,
+            hourly["pop"][start:end],
+            hourly["solar"][start:end],
         ):
-            if t.date() != target_date:
-                continue
-
             hk = t.strftime("%H:00")
             if hk not in seen_hours:
                 seen_hours.add(hk)
                 time_index.append(t)
 
-            cells[hk] = (weather_icon(cc, pr, t), pr, int(pop or 0), _to_float(solar))
+            cells[hk] = (icon, pr, int(pop or 0), _to_float(solar))
 
         cell_map[p.label] = cells
 
     # Sort the hours left-to-right
     time_index.sort(key=lambda x: x)
 
-    html = render_html(
+    # Rectangular grid in render order: rows[hour_idx][place_idx]
+    hour_keys = [t.strftime("%H:00") for t in time_index]
+    grid = [[cell_map[p.label].get(hk, EMPTY_CELL) for hk in hour_keys] for p in places]
+    rows = list(zip(*grid))
+
+    ctx = matrix_context(
         target_date=target_date,
         min_date=min_date,
         max_date=max_date,
@@ -1903,26 +1929,32 @@ def index():
         lists_info=lists_info,
         active_list_id=active_list_id,
         time_index=time_index,
-        cell_map=cell_map,
+        rows=rows,
         from_cache=False,
         nocache=nocache,
         base_params=base_params,
         view=view,
     )
 
+    if nocache:
+        # Nothing to cache: stream rows out as they are formatted
+        return Response(iter_html(ctx), mimetype="text/html")
+
     # Store in cache (only if not nocache)
-    if not nocache:
-        cache_put(
-            query_date=qdate.isoformat(),
-            target_date=target_date.isoformat(),
-            tz=tz,
-            country=country,
-            model=model,
-            places_sig=p_sig,
-            html=html,
-        )
+    html_gz = gzip_html(render_html(ctx))
+    created_at = cache_put(
+        query_date=qdate.isoformat(),
+        target_date=target_date.isoformat(),
+        tz=tz,
+        country=country,
+        model=model,
+        places_sig=p_sig,
+        html_gz=html_gz,
+    )
 
-    return Response(html, mimetype="text/html")
+    etag = page_etag(qdate.isoformat(), target_date.isoformat(), tz, country, model, p_sig, created_at)
+    html_path = cache_file_path(qdate.isoformat(), target_date.isoformat(), tz, country, model, p_sig, created_at)
+    return cached_page_response(html_gz, etag, html_path)
 
 
 @app.get("/solar-site")
@@ -2019,8 +2051,9 @@ def solar_site_page():
     battery_days: List[Dict[str, object]] = []
     for day in sorted(by_day.keys())[:7]:
         points: List[Dict[str, object]] = []
-        for t, solar in zip(hourly["time"], hourly["solar"]):
-            if t.date() != day or not (6 <= t.hour <= 18):
+        start, end = day_window(hourly["time"], day)
+        for t, solar in zip(hourly["time"][start:end], hourly["solar"][start:end]):
+            if not (6 <= t.hour <= 18):
                 continue
             production_kwh = daily_solar_production_kwh(system_kw, _to_float(solar), efficiency_factor)
             points.append(
@@ -0,0 +1,19 @@
+document.getElementById("downloadBtn").addEventListener("click", function (e) {
+  e.preventDefault();
+
+  const table = document.getElementById(this.dataset.tableId);
+  const prefix = this.dataset.downloadPrefix;
+
+  html2canvas(table, {
+    backgroundColor: "#ffffff",
+    scale: 2,
+    useCORS: true
+  }).then(canvas => {
+    const link = document.createElement("a");
+    const d = new Date().toISOString().slice(0,10);
+
+    link.download = `${prefix}-${d}.jpg`;
+    link.href = canvas.toDataURL("image/jpeg", 0.95);
+    link.click();
+  });
+});